@@ -13,10 +13,85 @@ import math
 import base64
 import tempfile
 import os
+import queue
 import threading
+from concurrent.futures import Future
 
+import numpy as np
 import pyttsx3
 
+from .rng import thread_rng
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:  # SciPy is optional; fall back to linear interpolation
+    resample_poly = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to the NumPy noise path
+    njit = None
+
+
+def _sinusoid(n, freq, sample_rate):
+    """Return sin(2*pi*freq*t) for n samples using the angle-addition identity.
+
+    Splitting the index into block * k + j gives
+    sin((bk + j)w) = sin(bkw)cos(jw) + cos(bkw)sin(jw), so only O(sqrt(n))
+    transcendentals are evaluated and the rest is two outer products.
+    """
+    w = 2 * math.pi * freq / sample_rate
+    block = max(1, math.isqrt(n))
+    n_blocks = -(-n // block)
+    inner = np.arange(block) * w
+    outer = np.arange(n_blocks) * (block * w)
+    out = np.multiply.outer(np.sin(outer).astype(np.float32), np.cos(inner).astype(np.float32))
+    out += np.multiply.outer(np.cos(outer).astype(np.float32), np.sin(inner).astype(np.float32))
+    return out.ravel()[:n]
+
+
+if njit is not None:
+    # An explicit signature compiles (or loads from cache) at import time, so
+    # the JIT cost never lands on the first captcha request
+    @njit('float32[::1](float32[::1], int64, float32[::1], float64, float64, float64, '
+          'int64[::1], int64[::1], float64[::1], float64, float64)',
+          cache=True, fastmath=True)
+    def _noise_kernel(samples, sample_rate, unit_noise, noise_vol, hum_freq, hum_vol,
+                      crackle_starts, crackle_lengths, crackle_vols, warble_freq, warble_depth):
+        """Apply all four noise passes in place with a single sweep over the buffer.
+
+        unit_noise holds uniform [0, 1) draws: the first n feed the white noise
+        and the rest feed the crackle bursts, which only touch a few hundred
+        samples each and so are added first. White noise, hum and warble are
+        then fused into one loop, with both oscillators advanced by the
+        recurrence s[i+1] = 2cos(w)s[i] - s[i-1].
+        """
+        n = samples.shape[0]
+
+        offset = n
+        for k in range(crackle_starts.shape[0]):
+            end = min(crackle_starts[k] + crackle_lengths[k], n)
+            for i in range(crackle_starts[k], end):
+                samples[i] += (2.0 * unit_noise[offset] - 1.0) * crackle_vols[k]
+                offset += 1
+
+        hum_w = 2 * np.pi * hum_freq / sample_rate
+        warble_w = 2 * np.pi * warble_freq / sample_rate
+        hum_c = 2 * np.cos(hum_w)
+        warble_c = 2 * np.cos(warble_w)
+        hum_prev, hum_cur = -np.sin(hum_w), 0.0
+        warble_prev, warble_cur = -np.sin(warble_w), 0.0
+
+        for i in range(n):
+            value = samples[i] + (2.0 * unit_noise[i] - 1.0) * noise_vol + hum_vol * hum_cur
+            samples[i] = value * (1.0 + warble_depth * warble_cur)
+            hum_prev, hum_cur = hum_cur, hum_c * hum_cur - hum_prev
+            warble_prev, warble_cur = warble_cur, warble_c * warble_cur - warble_prev
+
+        return samples
+else:
+    _noise_kernel = None
+
 
 class AudioCaptcha:
     """Generates spoken-word audio captcha using system TTS."""
@@ -32,35 +107,73 @@ class AudioCaptcha:
         'W': 'double you', 'X': 'ex', 'Y': 'why', 'Z': 'zed',
     }
 
+    # RAM-backed scratch directory for TTS output (None = system default)
+    SPEECH_TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
     def __init__(self):
         self.characters = string.digits
         self._lock = threading.Lock()
+        self._tts_jobs = queue.Queue()
+        self._tts_thread = None
 
     def generate_text(self, length=5):
         """Generate random captcha text (digits for clear audio recognition)."""
         return ''.join(random.choices(self.characters, k=length))
 
-    def _generate_speech_wav(self, spoken_text):
-        """Use pyttsx3 to generate WAV speech and return raw WAV bytes."""
-        temp_path = tempfile.mktemp(suffix='.wav')
-
-        try:
-            with self._lock:
-                engine = pyttsx3.init()
+    def _tts_worker(self):
+        """Own the pyttsx3 engine and run queued speech jobs on this one thread.
+
+        SAPI5 and NSSS drivers bind their COM/Cocoa objects to the thread that
+        created them, so the engine is created, driven and reused only here.
+        """
+        engine = None
+        voices = None
+        while True:
+            spoken_text, path, rate, future = self._tts_jobs.get()
+            try:
+                if engine is None:
+                    engine = pyttsx3.init()
+                    voices = engine.getProperty('voices')
 
-                # Randomize speech rate for variation (normal ~150-200)
-                rate = random.randint(120, 160)
                 engine.setProperty('rate', rate)
                 engine.setProperty('volume', 0.9)
 
                 # Try to pick a voice (prefer female for clarity variation)
-                voices = engine.getProperty('voices')
                 if voices and len(voices) > 1:
                     engine.setProperty('voice', random.choice(voices).id)
 
-                engine.save_to_file(spoken_text, temp_path)
+                engine.save_to_file(spoken_text, path)
                 engine.runAndWait()
-                engine.stop()
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+
+    def _synthesize(self, spoken_text, path, rate):
+        """Queue a speech job for the TTS thread and block until the WAV is written."""
+        with self._lock:
+            if self._tts_thread is None:
+                self._tts_thread = threading.Thread(
+                    target=self._tts_worker, name='audio-captcha-tts', daemon=True)
+                self._tts_thread.start()
+
+        future = Future()
+        self._tts_jobs.put((spoken_text, path, rate, future))
+        future.result()
+
+    def _generate_speech_wav(self, spoken_text):
+        """Use pyttsx3 to generate WAV speech and return raw WAV bytes."""
+        # Prefer tmpfs so the TTS round-trip never touches disk
+        with tempfile.NamedTemporaryFile(dir=self.SPEECH_TEMP_DIR, suffix='.wav', delete=False) as f:
+            temp_path = f.name
+
+        # Randomize speech rate for variation (normal ~150-200)
+        rate = random.randint(120, 160)
+
+        try:
+            # Only the TTS driver is serialized (on its own thread); decoding
+            # and noise mixing in generate_audio run in the caller's thread.
+            self._synthesize(spoken_text, temp_path, rate)
 
             # Read the WAV file
             with open(temp_path, 'rb') as f:
@@ -86,98 +199,93 @@ class AudioCaptcha:
 
         # Convert to 16-bit mono samples
         if sampwidth == 2:
-            samples = struct.unpack(f'<{len(raw_data) // 2}h', raw_data)
+            samples = np.frombuffer(raw_data, dtype='<i2')
         elif sampwidth == 1:
-            samples = [((b - 128) * 256) for b in raw_data]
+            samples = np.frombuffer(raw_data, dtype=np.uint8).astype(np.int16)
+            samples -= 128
+            samples <<= 8
         else:
-            # 24-bit or other — downsample to 16-bit
-            samples = []
-            for i in range(0, len(raw_data), sampwidth):
-                val = int.from_bytes(raw_data[i:i + sampwidth], 'little', signed=True)
-                samples.append(val >> (8 * (sampwidth - 2)))
-
-        # If stereo, convert to mono by averaging channels
-        if n_channels == 2:
-            mono = []
-            for i in range(0, len(samples), 2):
-                if i + 1 < len(samples):
-                    mono.append((samples[i] + samples[i + 1]) // 2)
-                else:
-                    mono.append(samples[i])
-            samples = mono
+            # 24-bit or other — keep the two most significant bytes of each sample
+            frames = np.frombuffer(raw_data, dtype=np.uint8).reshape(-1, sampwidth)
+            samples = np.ascontiguousarray(frames[:, -2:]).view('<i2').ravel()
+
+        # If stereo (or more), convert to mono by averaging channels
+        if n_channels > 1:
+            samples = samples[:len(samples) // n_channels * n_channels]
+            samples = samples.reshape(-1, n_channels).mean(axis=1, dtype=np.float32)
 
         # Normalize to float [-1.0, 1.0]
-        float_samples = [s / 32768.0 for s in samples]
+        float_samples = samples.astype(np.float32) * np.float32(1.0 / 32768.0)
         return float_samples, framerate
 
     def _resample(self, samples, from_rate, to_rate):
-        """Simple linear interpolation resampling."""
+        """Resample with a polyphase anti-aliasing filter, or linear interpolation without SciPy."""
         if from_rate == to_rate:
             return samples
 
+        if resample_poly is not None:
+            g = math.gcd(from_rate, to_rate)
+            resampled = resample_poly(samples, to_rate // g, from_rate // g)
+            return resampled.astype(np.float32)
+
+        if len(samples) == 0:
+            return samples.astype(np.float32)
+
         ratio = from_rate / to_rate
         new_length = int(len(samples) / ratio)
-        resampled = []
-        for i in range(new_length):
-            src_idx = i * ratio
-            idx = int(src_idx)
-            frac = src_idx - idx
-            if idx + 1 < len(samples):
-                val = samples[idx] * (1 - frac) + samples[idx + 1] * frac
-            else:
-                val = samples[idx] if idx < len(samples) else 0.0
-            resampled.append(val)
-        return resampled
+        x_new = np.arange(new_length) * ratio
+        resampled = np.interp(x_new, np.arange(len(samples)), samples)
+        return resampled.astype(np.float32)
 
     def _add_noise(self, samples, sample_rate):
         """Add background noise and distortion to make it harder for bots."""
+        rng = thread_rng()
         n = len(samples)
 
         # 1. White noise
-        noise_vol = random.uniform(0.02, 0.06)
-        for i in range(n):
-            samples[i] += random.uniform(-noise_vol, noise_vol)
+        noise_vol = rng.uniform(0.02, 0.06)
 
         # 2. Low-frequency hum
-        hum_freq = random.uniform(45, 65)
-        hum_vol = random.uniform(0.02, 0.05)
-        for i in range(n):
-            t = i / sample_rate
-            samples[i] += hum_vol * math.sin(2 * math.pi * hum_freq * t)
+        hum_freq = rng.uniform(45, 65)
+        hum_vol = rng.uniform(0.02, 0.05)
 
         # 3. Random crackle bursts
-        for _ in range(random.randint(3, 8)):
-            start = random.randint(0, max(0, n - 500))
-            length = random.randint(80, 300)
-            crackle_vol = random.uniform(0.03, 0.08)
-            for i in range(start, min(start + length, n)):
-                samples[i] += random.uniform(-crackle_vol, crackle_vol)
+        n_crackles = rng.integers(3, 9)
+        crackle_starts = rng.integers(0, max(0, n - 500) + 1, n_crackles)
+        crackle_lengths = rng.integers(80, 301, n_crackles)
+        crackle_vols = rng.uniform(0.03, 0.08, n_crackles)
 
         # 4. Slight pitch warble
-        warble_freq = random.uniform(2, 4)
-        warble_depth = random.uniform(0.003, 0.008)
-        for i in range(n):
-            t = i / sample_rate
-            samples[i] *= (1.0 + warble_depth * math.sin(2 * math.pi * warble_freq * t))
+        warble_freq = rng.uniform(2, 4)
+        warble_depth = rng.uniform(0.003, 0.008)
+
+        if _noise_kernel is not None:
+            unit_noise = rng.random(n + int(crackle_lengths.sum()), dtype=np.float32)
+            return _noise_kernel(samples, sample_rate, unit_noise, noise_vol,
+                                 hum_freq, hum_vol, crackle_starts, crackle_lengths,
+                                 crackle_vols, warble_freq, warble_depth)
+
+        samples += rng.uniform(-noise_vol, noise_vol, n).astype(np.float32)
+        samples += np.float32(hum_vol) * _sinusoid(n, hum_freq, sample_rate)
+        for start, length, crackle_vol in zip(crackle_starts, crackle_lengths, crackle_vols):
+            burst = samples[start:start + length]
+            burst += rng.uniform(-crackle_vol, crackle_vol, len(burst)).astype(np.float32)
+        samples *= 1.0 + np.float32(warble_depth) * _sinusoid(n, warble_freq, sample_rate)
 
         return samples
 
     def _samples_to_wav(self, samples, sample_rate=22050):
-        """Convert float samples to WAV bytes."""
-        buffer = io.BytesIO()
-        with wave.open(buffer, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sample_rate)
-
-            packed = b''
-            for s in samples:
-                clamped = max(-1.0, min(1.0, s))
-                packed += struct.pack('<h', int(clamped * 32767))
-            wf.writeframes(packed)
-
-        buffer.seek(0)
-        return buffer.getvalue()
+        """Convert float samples to mono 16-bit WAV bytes with a hand-built RIFF header."""
+        clamped = np.clip(samples, -1.0, 1.0)
+        pcm = (clamped * 32767.0).astype('<i2').tobytes()
+
+        header = struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + len(pcm), b'WAVE',
+            b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+            b'data', len(pcm),
+        )
+        return header + pcm
 
     def generate_audio(self, text):
         """Generate spoken audio for the captcha text with noise."""
@@ -196,16 +304,20 @@ class AudioCaptcha:
         # Convert to float samples
         float_samples, original_rate = self._wav_to_samples(wav_bytes)
 
-        # Resample to standard rate if needed
+        # Resample to standard rate if needed; within 10% the native rate is
+        # kept as-is, since the difference is inaudible under the added noise
         target_rate = 22050
-        if original_rate != target_rate:
+        if abs(original_rate - target_rate) / target_rate < 0.1:
+            output_rate = original_rate
+        else:
             float_samples = self._resample(float_samples, original_rate, target_rate)
+            output_rate = target_rate
 
         # Add noise distortion
-        float_samples = self._add_noise(float_samples, target_rate)
+        float_samples = self._add_noise(float_samples, output_rate)
 
         # Convert back to WAV
-        return self._samples_to_wav(float_samples, target_rate)
+        return self._samples_to_wav(float_samples, output_rate)
 
     def generate(self, length=5):
         """Generate captcha text and spoken audio, return base64 encoded audio and text."""
@@ -0,0 +1,18 @@
+"""
+Per-Thread Random Generators
+Hands each thread its own NumPy Generator so concurrent captcha requests never share RNG state
+"""
+
+import threading
+
+import numpy as np
+
+_local = threading.local()
+
+
+def thread_rng():
+    """Return the calling thread's NumPy Generator, creating it on first use"""
+    rng = getattr(_local, 'rng', None)
+    if rng is None:
+        rng = _local.rng = np.random.default_rng()
+    return rng
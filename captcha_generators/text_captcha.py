@@ -9,16 +9,26 @@ import string
 import math
 import io
 import base64
+import threading
+from collections import OrderedDict
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageChops
 
+from .rng import thread_rng
+
 
 class TextCaptcha:
+    # 32 characters x 17 font sizes (34-50) x 2 canvas sizes stays below this
+    GLYPH_CACHE_SIZE = 2048
+    
     def __init__(self, width=280, height=90):
         self.width = width
         self.height = height
         self.characters = string.ascii_uppercase + string.digits
         # Remove confusing characters
         self.characters = self.characters.replace('O', '').replace('0', '').replace('I', '').replace('1', '')
+        self._glyph_cache = OrderedDict()
+        self._glyph_lock = threading.Lock()
     
     def generate_text(self, length=6):
         """Generate random captcha text"""
@@ -36,34 +46,154 @@ class TextCaptcha:
             except:
                 return ImageFont.load_default()
     
+    def _get_glyph_mask(self, char, font, size):
+        """Return the cached grayscale coverage mask for char drawn at (10, 10)"""
+        # Identify the face by its file; in-memory fonts (load_default) get a new
+        # BytesIO per load, so fall back to the family/style name for those
+        face = getattr(font, 'path', None)
+        if not isinstance(face, str):
+            face = font.getname() if hasattr(font, 'getname') else None
+        key = (char, face, getattr(font, 'size', None), size)
+        with self._glyph_lock:
+            mask = self._glyph_cache.get(key)
+            if mask is not None:
+                self._glyph_cache.move_to_end(key)
+                return mask
+        
+        mask = Image.new('L', size, 0)
+        ImageDraw.Draw(mask).text((10, 10), char, font=font, fill=255)
+        with self._glyph_lock:
+            self._glyph_cache[key] = mask
+            if len(self._glyph_cache) > self.GLYPH_CACHE_SIZE:
+                self._glyph_cache.popitem(last=False)
+        return mask
+    
+    def _render_char(self, char, font, color, size=(60, 70)):
+        """Return an RGBA image of a single character in color, built from the cached glyph mask"""
+        mask = self._get_glyph_mask(char, font, size)
+        if len(color) == 4 and color[3] != 255:
+            mask = ImageChops.multiply(mask, Image.new('L', size, color[3]))
+        char_img = Image.new('RGBA', size, tuple(color[:3]) + (0,))
+        char_img.putalpha(mask)
+        return char_img
+    
+    def _soften(self, image, radius):
+        """Light finishing blur; sub-pixel radii use a variance-matched 3-tap BoxBlur"""
+        if radius < 0.35:
+            # Too faint to matter for obfuscation; skip the full-image pass
+            return image
+        variance = radius ** 2
+        if variance > 2 / 3:
+            # Beyond what a 3-tap box can match (radius ~0.82); keep the real Gaussian
+            return image.filter(ImageFilter.GaussianBlur(radius=radius))
+        return image.filter(ImageFilter.BoxBlur(variance / (2 * (1 - variance))))
+    
+    def _add_dots(self, image, xs, ys, colors):
+        """Set every (x, y) pixel to its color in one array store, skipping out-of-bounds points"""
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        arr = np.array(image)
+        arr[ys[inside], xs[inside]] = colors[inside]
+        return Image.fromarray(arr)
+    
+    # ======== Backgrounds ========
+    
+    def _bg_classic(self):
+        """Light vertical gradient"""
+        # Gradient background, built as one array instead of per-pixel draws
+        y = np.arange(self.height)[:, None]
+        r = (240 + 15 * y / self.height).astype(np.uint8)
+        b = (250 - 10 * y / self.height).astype(np.uint8)
+        rows = np.stack([r, r, b], axis=-1)
+        bg = np.broadcast_to(rows, (self.height, self.width, 3)).copy()
+        return Image.fromarray(bg, 'RGB')
+    
+    def _bg_shadow_outline(self):
+        """Dark two-color gradient with a subtle grid"""
+        image = Image.new('RGB', (self.width, self.height))
+        draw = ImageDraw.Draw(image)
+        
+        # Dark gradient background
+        r1, g1, b1 = random.randint(20, 50), random.randint(20, 50), random.randint(40, 80)
+        r2, g2, b2 = random.randint(50, 90), random.randint(30, 60), random.randint(60, 110)
+        for y in range(self.height):
+            t = y / self.height
+            r = int(r1 + (r2 - r1) * t)
+            g = int(g1 + (g2 - g1) * t)
+            b = int(b1 + (b2 - b1) * t)
+            draw.line([(0, y), (self.width, y)], fill=(r, g, b))
+        
+        # Subtle grid lines
+        grid_color = (r1 + 25, g1 + 25, b1 + 25)
+        for x in range(0, self.width, random.randint(12, 20)):
+            draw.line([(x, 0), (x, self.height)], fill=grid_color, width=1)
+        for y in range(0, self.height, random.randint(12, 20)):
+            draw.line([(0, y), (self.width, y)], fill=grid_color, width=1)
+        return image
+    
+    def _bg_colorful_overlap(self):
+        """Near-white background with a cross-hatch pattern"""
+        image = Image.new('RGB', (self.width, self.height), (250, 250, 252))
+        draw = ImageDraw.Draw(image)
+        
+        # Cross-hatch pattern
+        hatch_color = (random.randint(210, 235), random.randint(210, 235), random.randint(210, 235))
+        spacing = random.randint(8, 14)
+        for x in range(-self.height, self.width, spacing):
+            draw.line([(x, 0), (x + self.height, self.height)], fill=hatch_color, width=1)
+        for x in range(0, self.width + self.height, spacing):
+            draw.line([(x, 0), (x - self.height, self.height)], fill=hatch_color, width=1)
+        return image
+    
+    def _bg_pixelated_blocks(self):
+        """Grid of randomly tinted blocks"""
+        # Tiled block background: one tint per block, upscaled with np.repeat
+        rng = thread_rng()
+        block_size = int(rng.integers(10, 19))
+        blocks_x = -(-self.width // block_size)
+        blocks_y = -(-self.height // block_size)
+        shades = rng.integers(215, 251, (blocks_y, blocks_x, 1))
+        tint_offsets = np.array([(0, -5, -10), (-10, 0, -5), (-5, -10, 0)])
+        tints = tint_offsets[rng.integers(0, 3, (blocks_y, blocks_x))]
+        tiles = (shades + tints).astype(np.uint8)
+        bg = tiles.repeat(block_size, axis=0).repeat(block_size, axis=1)
+        return Image.fromarray(np.ascontiguousarray(bg[:self.height, :self.width]), 'RGB')
+    
+    def _bg_striped(self):
+        """Alternating horizontal color stripes"""
+        # Horizontal stripe background
+        stripe_height = random.randint(3, 6)
+        color_a = (random.randint(220, 245), random.randint(220, 245), random.randint(230, 255))
+        color_b = (color_a[0] - random.randint(10, 25),
+                   color_a[1] - random.randint(10, 25),
+                   color_a[2] - random.randint(10, 25))
+        rows = np.empty((self.height, 3), dtype=np.uint8)
+        stripe_idx = (np.arange(self.height) // stripe_height) & 1
+        rows[stripe_idx == 0] = color_a
+        rows[stripe_idx == 1] = color_b
+        bg = np.broadcast_to(rows[:, None, :], (self.height, self.width, 3)).copy()
+        return Image.fromarray(bg, 'RGB')
+    
     # ======== STYLE 1: Classic (original) ========
     
     def _style_classic(self, text):
         """Original style: gradient background, rotated chars, noise lines & dots, blur"""
-        image = Image.new('RGB', (self.width, self.height), (255, 255, 255))
+        image = self._bg_classic()
         draw = ImageDraw.Draw(image)
         
-        # Gradient background
-        for y in range(self.height):
-            r = int(240 + (15 * y / self.height))
-            g = int(240 + (15 * y / self.height))
-            b = int(250 - (10 * y / self.height))
-            for x in range(self.width):
-                draw.point((x, y), fill=(r, g, b))
-        
         # Noise lines
-        for _ in range(random.randint(4, 8)):
-            x1, y1 = random.randint(0, self.width), random.randint(0, self.height)
-            x2, y2 = random.randint(0, self.width), random.randint(0, self.height)
-            color = (random.randint(100, 180), random.randint(100, 180), random.randint(100, 180))
-            draw.line([(x1, y1), (x2, y2)], fill=color, width=1)
+        rng = thread_rng()
+        n_lines = int(rng.integers(4, 9))
+        ends = rng.integers(0, (self.width + 1, self.height + 1) * 2, (n_lines, 4))
+        colors = rng.integers(100, 181, (n_lines, 3))
+        for (x1, y1, x2, y2), color in zip(ends.tolist(), colors.tolist()):
+            draw.line([(x1, y1), (x2, y2)], fill=tuple(color), width=1)
         
         # Noise dots
-        for _ in range(random.randint(100, 200)):
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            color = (random.randint(100, 200), random.randint(100, 200), random.randint(100, 200))
-            draw.point((x, y), fill=color)
+        n_dots = int(rng.integers(100, 201))
+        xs = rng.integers(0, self.width, n_dots)
+        ys = rng.integers(0, self.height, n_dots)
+        colors = rng.integers(100, 201, (n_dots, 3), dtype=np.uint8)
+        image = self._add_dots(image, xs, ys, colors)
         
         # Draw rotated characters
         font = self._get_font()
@@ -74,15 +204,13 @@ class TextCaptcha:
             y = random.randint(10, 30)
             color = (random.randint(0, 80), random.randint(0, 80), random.randint(80, 150))
             
-            char_img = Image.new('RGBA', (60, 70), (255, 255, 255, 0))
-            char_draw = ImageDraw.Draw(char_img)
-            char_draw.text((10, 10), char, font=font, fill=color)
+            char_img = self._render_char(char, font, color)
             
             angle = random.randint(-25, 25)
             char_img = char_img.rotate(angle, expand=True, resample=Image.BICUBIC)
             image.paste(char_img, (int(x), int(y)), char_img)
         
-        image = image.filter(ImageFilter.GaussianBlur(radius=0.5))
+        image = self._soften(image, 0.5)
         return image
     
     # ======== STYLE 2: Wave Warp ========
@@ -100,25 +228,29 @@ class TextCaptcha:
         draw = ImageDraw.Draw(image)
         
         # Curved noise lines
-        for _ in range(random.randint(3, 6)):
-            points = []
-            y_start = random.randint(0, self.height)
-            amplitude = random.randint(10, 30)
-            freq = random.uniform(0.02, 0.06)
-            color = (random.randint(140, 200), random.randint(140, 200), random.randint(140, 200))
-            for x in range(0, self.width, 2):
-                y = y_start + int(amplitude * math.sin(freq * x + random.uniform(0, math.pi)))
-                points.append((x, y))
+        rng = thread_rng()
+        for _ in range(rng.integers(3, 7)):
+            y_start = rng.integers(0, self.height + 1)
+            amplitude = rng.integers(10, 31)
+            freq = rng.uniform(0.02, 0.06)
+            color = tuple(rng.integers(140, 201, 3).tolist())
+            xs = np.arange(0, self.width, 2)
+            phases = rng.uniform(0, math.pi, len(xs))
+            ys = y_start + (amplitude * np.sin(freq * xs + phases)).astype(int)
+            points = list(zip(xs.tolist(), ys.tolist()))
             if len(points) >= 2:
                 draw.line(points, fill=color, width=1)
         
         # Dot clusters
-        for _ in range(random.randint(5, 12)):
-            cx, cy = random.randint(0, self.width), random.randint(0, self.height)
-            for _ in range(random.randint(5, 15)):
-                dx, dy = random.randint(-8, 8), random.randint(-8, 8)
-                color = (random.randint(150, 210), random.randint(150, 210), random.randint(150, 210))
-                draw.point((cx + dx, cy + dy), fill=color)
+        n_clusters = int(rng.integers(5, 13))
+        sizes = rng.integers(5, 16, n_clusters)
+        n_dots = int(sizes.sum())
+        xs = np.repeat(rng.integers(0, self.width + 1, n_clusters), sizes)
+        ys = np.repeat(rng.integers(0, self.height + 1, n_clusters), sizes)
+        xs += rng.integers(-8, 9, n_dots)
+        ys += rng.integers(-8, 9, n_dots)
+        colors = rng.integers(150, 211, (n_dots, 3), dtype=np.uint8)
+        image = self._add_dots(image, xs, ys, colors)
         
         # Draw each character with sine-wave vertical offset
         font = self._get_font(random.randint(36, 46))
@@ -134,47 +266,28 @@ class TextCaptcha:
             
             color = (random.randint(10, 90), random.randint(10, 90), random.randint(40, 120))
             
-            char_img = Image.new('RGBA', (60, 70), (0, 0, 0, 0))
-            char_draw = ImageDraw.Draw(char_img)
-            char_draw.text((10, 10), char, font=font, fill=color)
+            char_img = self._render_char(char, font, color)
             
             angle = random.randint(-15, 15)
             char_img = char_img.rotate(angle, expand=True, resample=Image.BICUBIC)
             image.paste(char_img, (int(x), int(y)), char_img)
         
-        image = image.filter(ImageFilter.GaussianBlur(radius=0.3))
+        image = self._soften(image, 0.3)
         return image
     
     # ======== STYLE 3: Shadow & Outline ========
     
     def _style_shadow_outline(self, text):
         """Dark gradient background with outlined/shadowed white text and grid noise"""
-        image = Image.new('RGB', (self.width, self.height))
-        draw = ImageDraw.Draw(image)
-        
-        # Dark gradient background
-        r1, g1, b1 = random.randint(20, 50), random.randint(20, 50), random.randint(40, 80)
-        r2, g2, b2 = random.randint(50, 90), random.randint(30, 60), random.randint(60, 110)
-        for y in range(self.height):
-            t = y / self.height
-            r = int(r1 + (r2 - r1) * t)
-            g = int(g1 + (g2 - g1) * t)
-            b = int(b1 + (b2 - b1) * t)
-            draw.line([(0, y), (self.width, y)], fill=(r, g, b))
-        
-        # Subtle grid lines
-        grid_color = (r1 + 25, g1 + 25, b1 + 25)
-        for x in range(0, self.width, random.randint(12, 20)):
-            draw.line([(x, 0), (x, self.height)], fill=grid_color, width=1)
-        for y in range(0, self.height, random.randint(12, 20)):
-            draw.line([(0, y), (self.width, y)], fill=grid_color, width=1)
+        image = self._bg_shadow_outline()
         
         # Spark dots
-        for _ in range(random.randint(30, 70)):
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            brightness = random.randint(100, 200)
-            draw.point((x, y), fill=(brightness, brightness, brightness))
+        rng = thread_rng()
+        n_dots = int(rng.integers(30, 71))
+        xs = rng.integers(0, self.width, n_dots)
+        ys = rng.integers(0, self.height, n_dots)
+        brightness = rng.integers(100, 201, n_dots, dtype=np.uint8)
+        image = self._add_dots(image, xs, ys, np.repeat(brightness[:, None], 3, axis=1))
         
         # Draw text with shadow and outline
         font = self._get_font(random.randint(38, 48))
@@ -204,34 +317,28 @@ class TextCaptcha:
             char_img = char_img.rotate(angle, expand=True, resample=Image.BICUBIC)
             image.paste(char_img, (int(x), int(y)), char_img)
         
-        image = image.filter(ImageFilter.GaussianBlur(radius=0.4))
+        image = self._soften(image, 0.4)
         return image
     
     # ======== STYLE 4: Colorful Overlap ========
     
     def _style_colorful_overlap(self, text):
         """White background with bold random-colored characters and cross-hatch / arcs"""
-        image = Image.new('RGB', (self.width, self.height), (250, 250, 252))
+        image = self._bg_colorful_overlap()
         draw = ImageDraw.Draw(image)
         
-        # Cross-hatch pattern
-        hatch_color = (random.randint(210, 235), random.randint(210, 235), random.randint(210, 235))
-        spacing = random.randint(8, 14)
-        for x in range(-self.height, self.width, spacing):
-            draw.line([(x, 0), (x + self.height, self.height)], fill=hatch_color, width=1)
-        for x in range(0, self.width + self.height, spacing):
-            draw.line([(x, 0), (x - self.height, self.height)], fill=hatch_color, width=1)
-        
         # Random arcs
-        for _ in range(random.randint(3, 7)):
-            x0 = random.randint(-30, self.width)
-            y0 = random.randint(-30, self.height)
-            x1 = x0 + random.randint(40, 120)
-            y1 = y0 + random.randint(40, 80)
-            start_angle = random.randint(0, 360)
-            end_angle = start_angle + random.randint(60, 180)
-            arc_color = (random.randint(160, 220), random.randint(160, 220), random.randint(160, 220))
-            draw.arc([(x0, y0), (x1, y1)], start_angle, end_angle, fill=arc_color, width=1)
+        rng = thread_rng()
+        n_arcs = int(rng.integers(3, 8))
+        origins = rng.integers(-30, (self.width + 1, self.height + 1), (n_arcs, 2))
+        extents = rng.integers((40, 40), (121, 81), (n_arcs, 2))
+        starts = rng.integers(0, 361, n_arcs)
+        sweeps = rng.integers(60, 181, n_arcs)
+        colors = rng.integers(160, 221, (n_arcs, 3))
+        for (x0, y0), (w, h), start_angle, sweep, color in zip(
+                origins.tolist(), extents.tolist(), starts.tolist(), sweeps.tolist(), colors.tolist()):
+            draw.arc([(x0, y0), (x0 + w, y0 + h)], start_angle, start_angle + sweep,
+                     fill=tuple(color), width=1)
         
         # Vibrant color palette
         palette = [
@@ -248,42 +355,30 @@ class TextCaptcha:
             y = random.randint(8, 28)
             color = random.choice(palette)
             
-            char_img = Image.new('RGBA', (65, 75), (0, 0, 0, 0))
-            char_draw = ImageDraw.Draw(char_img)
-            char_draw.text((10, 10), char, font=font, fill=color + (random.randint(200, 255),))
+            char_img = self._render_char(char, font, color + (random.randint(200, 255),), (65, 75))
             
             angle = random.randint(-22, 22)
             char_img = char_img.rotate(angle, expand=True, resample=Image.BICUBIC)
             image.paste(char_img, (int(x), int(y)), char_img)
         
-        image = image.filter(ImageFilter.GaussianBlur(radius=0.3))
+        image = self._soften(image, 0.3)
         return image
     
     # ======== STYLE 5: Pixelated Blocks ========
     
     def _style_pixelated_blocks(self, text):
         """Tiled colored blocks background with pixelated text and random rectangles"""
-        image = Image.new('RGB', (self.width, self.height), (240, 240, 240))
+        image = self._bg_pixelated_blocks()
         draw = ImageDraw.Draw(image)
         
-        # Tiled block background
-        block_size = random.randint(10, 18)
-        for bx in range(0, self.width, block_size):
-            for by in range(0, self.height, block_size):
-                shade = random.randint(215, 250)
-                tint = random.choice([(shade, shade - 5, shade - 10),
-                                       (shade - 10, shade, shade - 5),
-                                       (shade - 5, shade - 10, shade)])
-                draw.rectangle([(bx, by), (bx + block_size, by + block_size)], fill=tint)
-        
         # Random colored rectangles as noise
-        for _ in range(random.randint(6, 14)):
-            rx = random.randint(0, self.width)
-            ry = random.randint(0, self.height)
-            rw = random.randint(8, 30)
-            rh = random.randint(8, 25)
-            rect_color = (random.randint(170, 220), random.randint(170, 220), random.randint(170, 220))
-            draw.rectangle([(rx, ry), (rx + rw, ry + rh)], fill=rect_color, outline=rect_color)
+        rng = thread_rng()
+        n_rects = int(rng.integers(6, 15))
+        origins = rng.integers(0, (self.width + 1, self.height + 1), (n_rects, 2))
+        sizes = rng.integers((8, 8), (31, 26), (n_rects, 2))
+        colors = rng.integers(170, 221, (n_rects, 3))
+        for (rx, ry), (rw, rh), color in zip(origins.tolist(), sizes.tolist(), colors.tolist()):
+            draw.rectangle([(rx, ry), (rx + rw, ry + rh)], fill=tuple(color), outline=tuple(color))
         
         # Render text at full size first
         font = self._get_font(random.randint(38, 46))
@@ -298,9 +393,7 @@ class TextCaptcha:
             y = random.randint(14, 30)
             color = (random.randint(0, 60), random.randint(0, 60), random.randint(0, 60), 240)
             
-            char_img = Image.new('RGBA', (60, 70), (0, 0, 0, 0))
-            char_draw = ImageDraw.Draw(char_img)
-            char_draw.text((10, 10), char, font=font, fill=color)
+            char_img = self._render_char(char, font, color)
             angle = random.randint(-18, 18)
             char_img = char_img.rotate(angle, expand=True, resample=Image.BICUBIC)
             text_layer.paste(char_img, (int(x), int(y)), char_img)
@@ -320,18 +413,7 @@ class TextCaptcha:
     
     def _style_striped(self, text):
         """Horizontal color stripes background with vertical interference bars"""
-        image = Image.new('RGB', (self.width, self.height))
-        draw = ImageDraw.Draw(image)
-        
-        # Horizontal stripe background
-        stripe_height = random.randint(3, 6)
-        color_a = (random.randint(220, 245), random.randint(220, 245), random.randint(230, 255))
-        color_b = (color_a[0] - random.randint(10, 25),
-                   color_a[1] - random.randint(10, 25),
-                   color_a[2] - random.randint(10, 25))
-        for y in range(0, self.height, stripe_height):
-            color = color_a if (y // stripe_height) % 2 == 0 else color_b
-            draw.rectangle([(0, y), (self.width, y + stripe_height)], fill=color)
+        image = self._bg_striped()
         
         # Draw characters with alternating bold/thin appearance
         font_large = self._get_font(random.randint(42, 50))
@@ -345,30 +427,26 @@ class TextCaptcha:
             
             color = (random.randint(0, 70), random.randint(0, 70), random.randint(50, 130))
             
-            char_img = Image.new('RGBA', (65, 75), (0, 0, 0, 0))
-            char_draw = ImageDraw.Draw(char_img)
-            char_draw.text((10, 10), char, font=font, fill=color)
+            char_img = self._render_char(char, font, color, (65, 75))
             
             angle = random.randint(-20, 20)
             char_img = char_img.rotate(angle, expand=True, resample=Image.BICUBIC)
             image.paste(char_img, (int(x), int(y)), char_img)
         
-        # Vertical interference bars (semi-transparent overlay)
-        overlay = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        
-        bar_width = random.randint(2, 4)
-        bar_spacing = random.randint(8, 16)
-        for x in range(0, self.width, bar_spacing):
-            alpha = random.randint(30, 70)
-            bar_color = (random.randint(80, 180), random.randint(80, 180), random.randint(80, 180), alpha)
-            overlay_draw.rectangle([(x, 0), (x + bar_width, self.height)], fill=bar_color)
-        
-        image = image.convert('RGBA')
-        image = Image.alpha_composite(image, overlay)
-        image = image.convert('RGB')
-        
-        image = image.filter(ImageFilter.GaussianBlur(radius=0.4))
+        # Vertical interference bars, alpha-blended straight into the RGB array
+        arr = np.array(image)
+        rng = thread_rng()
+        bar_width = int(rng.integers(2, 5))
+        bar_spacing = int(rng.integers(8, 17))
+        bar_xs = range(0, self.width, bar_spacing)
+        alphas = rng.integers(30, 71, len(bar_xs)) / 255
+        bar_colors = rng.integers(80, 181, (len(bar_xs), 3))
+        for x, alpha, bar_color in zip(bar_xs, alphas, bar_colors):
+            bar = arr[:, x:x + bar_width + 1]
+            bar[:] = (bar * (1 - alpha) + bar_color * alpha).astype(np.uint8)
+        image = Image.fromarray(arr)
+        
+        image = self._soften(image, 0.4)
         return image
     
     # ======== Main generation methods ========
@@ -391,9 +469,10 @@ class TextCaptcha:
         text = self.generate_text(length)
         image = self.generate_image(text)
         
-        # Convert to base64
+        # Convert to base64 (palette PNG with fast zlib keeps encode time and payload small)
         buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
+        quantized = image.quantize(colors=64, method=Image.Quantize.FASTOCTREE)
+        quantized.save(buffer, format='PNG', optimize=False, compress_level=1)
         buffer.seek(0)
         image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
         
@@ -0,0 +1,84 @@
+"""Checks that the Numba and NumPy noise paths of AudioCaptcha agree"""
+import numpy as np
+
+import captcha_generators.audio_captcha as audio_module
+from captcha_generators.audio_captcha import AudioCaptcha
+
+ac = AudioCaptcha()
+
+# Loudest possible output on silent input: white noise + hum + all 8 crackle
+# bursts overlapping, scaled by the maximum warble
+MAX_NOISE_AMPLITUDE = (0.06 + 0.05 + 8 * 0.08) * 1.008
+
+
+def _add_noise(samples, sample_rate, seed, use_kernel):
+    """Run _add_noise with a seeded generator and the kernel switched on or off"""
+    saved_kernel, saved_thread_rng = audio_module._noise_kernel, audio_module.thread_rng
+    rng = np.random.default_rng(seed)
+    try:
+        audio_module.thread_rng = lambda: rng
+        if not use_kernel:
+            audio_module._noise_kernel = None
+        return ac._add_noise(samples.copy(), sample_rate)
+    finally:
+        audio_module._noise_kernel, audio_module.thread_rng = saved_kernel, saved_thread_rng
+
+
+def _hum_frequency(samples, sample_rate):
+    """Return the strongest frequency in the 45-65 Hz hum band"""
+    spectrum = np.abs(np.fft.rfft(samples))
+    freqs = np.fft.rfftfreq(len(samples), 1 / sample_rate)
+    band = (freqs >= 40) & (freqs <= 70)
+    return freqs[band][np.argmax(spectrum[band])]
+
+
+def _check_paths_agree(sample_rate):
+    silence = np.zeros(2 * sample_rate, dtype=np.float32)
+    outputs = [_add_noise(silence, sample_rate, seed=1234, use_kernel=flag) for flag in (False, True)]
+
+    hums = []
+    for out in outputs:
+        assert len(out) == len(silence)
+        assert out.dtype == np.float32
+        assert np.all(np.isfinite(out))
+        assert np.abs(out).max() <= MAX_NOISE_AMPLITUDE
+        hums.append(_hum_frequency(out, sample_rate))
+
+    # Same seed draws the same hum frequency on both paths, within one FFT bin
+    assert 45 <= hums[0] <= 65
+    assert abs(hums[0] - hums[1]) <= sample_rate / len(silence)
+
+    rms = [np.sqrt(np.mean(out.astype(np.float64) ** 2)) for out in outputs]
+    assert abs(rms[0] - rms[1]) <= 0.2 * rms[0]
+
+
+def test_numpy_noise_path():
+    silence = np.zeros(22050, dtype=np.float32)
+    out = _add_noise(silence, 22050, seed=7, use_kernel=False)
+    assert len(out) == len(silence)
+    assert out.dtype == np.float32
+    assert np.abs(out).max() <= MAX_NOISE_AMPLITUDE
+
+
+def test_kernel_matches_numpy_path():
+    if audio_module._noise_kernel is None:
+        print('  numba not installed, skipping kernel comparison')
+        return
+    for sample_rate in (22050, 24000):
+        _check_paths_agree(sample_rate)
+
+
+def test_short_buffers():
+    for n in (0, 1, 100):
+        for use_kernel in (False, True):
+            out = _add_noise(np.zeros(n, dtype=np.float32), 22050, seed=n, use_kernel=use_kernel)
+            assert len(out) == n
+            assert out.dtype == np.float32
+
+
+if __name__ == '__main__':
+    for name, fn in list(globals().items()):
+        if name.startswith('test_'):
+            print(f'Running {name}...')
+            fn()
+    print('ALL TESTS PASSED!')
@@ -0,0 +1,101 @@
+"""Round-trip checks for the AudioCaptcha WAV encoder and decoder"""
+import io
+import wave
+
+import numpy as np
+
+import captcha_generators.audio_captcha as audio_module
+from captcha_generators.audio_captcha import AudioCaptcha
+
+ac = AudioCaptcha()
+
+
+def _make_wav(n_channels, sampwidth, raw_data, framerate=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(n_channels)
+        wf.setsampwidth(sampwidth)
+        wf.setframerate(framerate)
+        wf.writeframes(raw_data)
+    return buffer.getvalue()
+
+
+def test_samples_to_wav_parses_with_wave():
+    samples = np.array([0.0, 0.5, -0.5, 1.0, -1.0, 2.0, -2.0, 0.1], dtype=np.float32)
+    wav_bytes = ac._samples_to_wav(samples, 22050)
+
+    with wave.open(io.BytesIO(wav_bytes), 'rb') as wf:
+        assert wf.getnchannels() == 1
+        assert wf.getsampwidth() == 2
+        assert wf.getframerate() == 22050
+        assert wf.getnframes() == len(samples)
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2')
+
+    expected = np.clip(samples.astype(np.float64), -1.0, 1.0) * 32767
+    assert np.all(np.abs(pcm - expected) <= 1)
+
+
+def test_wav_to_samples_16bit():
+    pcm = np.array([0, 1000, -1000, 32767, -32768, 5], dtype='<i2')
+
+    samples, rate = ac._wav_to_samples(_make_wav(1, 2, pcm.tobytes()))
+    assert rate == 16000
+    assert samples.dtype == np.float32
+    assert np.allclose(samples, pcm / 32768.0)
+
+    samples, _ = ac._wav_to_samples(_make_wav(2, 2, pcm.tobytes()))
+    assert np.allclose(samples, pcm.reshape(-1, 2).mean(axis=1) / 32768.0)
+
+
+def test_wav_to_samples_8bit():
+    raw = bytes([0, 64, 128, 200, 255, 128])
+    expected = (np.frombuffer(raw, dtype=np.uint8).astype(np.int32) - 128) * 256
+
+    samples, _ = ac._wav_to_samples(_make_wav(1, 1, raw))
+    assert np.allclose(samples, expected / 32768.0)
+
+    samples, _ = ac._wav_to_samples(_make_wav(2, 1, raw))
+    assert np.allclose(samples, expected.reshape(-1, 2).mean(axis=1) / 32768.0)
+
+
+def test_wav_to_samples_24bit():
+    values = [-8388608, 256000, -255995, 8388607, 0, -1]
+    raw = b''.join(v.to_bytes(3, 'little', signed=True) for v in values)
+    expected = np.array([v >> 8 for v in values])
+
+    samples, _ = ac._wav_to_samples(_make_wav(1, 3, raw))
+    assert np.allclose(samples, expected / 32768.0)
+
+    samples, _ = ac._wav_to_samples(_make_wav(2, 3, raw))
+    assert np.allclose(samples, expected.reshape(-1, 2).mean(axis=1) / 32768.0)
+
+
+def test_round_trip():
+    samples = np.linspace(-1.0, 1.0, 101, dtype=np.float32)
+    decoded, rate = ac._wav_to_samples(ac._samples_to_wav(samples, 22050))
+    assert rate == 22050
+    assert np.allclose(decoded, samples, atol=2 / 32768)
+
+
+def test_empty_wav_decodes_and_resamples():
+    samples, rate = ac._wav_to_samples(_make_wav(1, 2, b'', framerate=48000))
+    assert len(samples) == 0
+
+    saved_resample_poly = audio_module.resample_poly
+    try:
+        # Exercise the np.interp fallback as well as SciPy when it is installed
+        for resample_poly in {saved_resample_poly, None}:
+            audio_module.resample_poly = resample_poly
+            resampled = ac._resample(samples, rate, 22050)
+            assert len(resampled) == 0
+            assert resampled.dtype == np.float32
+    finally:
+        audio_module.resample_poly = saved_resample_poly
+
+
+if __name__ == '__main__':
+    for name, fn in list(globals().items()):
+        if name.startswith('test_'):
+            print(f'Running {name}...')
+            fn()
+    print('ALL TESTS PASSED!')